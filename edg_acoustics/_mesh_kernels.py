@@ -0,0 +1,235 @@
+"""This module provides the compiled kernels used by the mesh connectivity computation of
+:class:`edg_acoustics.Mesh`.
+
+The kernels are plain Python functions that are accelerated in one of two ways:
+
+1. Ahead of time: running ``python -m edg_acoustics._mesh_kernels`` compiles them with
+   ``numba.pycc`` into a ``_mesh_kernels_aot`` shared library next to this module. When that
+   library is present it is imported directly, which removes the numba JIT warm-up from the first
+   :class:`edg_acoustics.Mesh` construction of every Python session (useful for short interactive
+   and test runs).
+2. Just in time: if the ahead-of-time library has not been built but numba is installed, the
+   kernels are JIT-compiled with ``numba.njit`` (with on-disk caching of the compiled code).
+
+If neither is available, :data:`HAVE_COMPILED_KERNELS` is False and
+:meth:`edg_acoustics.Mesh.compute_element_connectivity` falls back to its vectorized NumPy
+implementation (the plain Python versions of the kernels in this module are too slow to be used
+directly).
+"""
+
+from __future__ import annotations
+import numpy
+
+try:
+    # numba is an optional dependency, used to speed up the mesh connectivity computation
+    import numba
+    from numba import prange
+except ImportError:
+    numba = None
+    prange = range
+
+__all__ = ["HAVE_COMPILED_KERNELS", "argsort_face_ids", "compute_face_ids", "match_faces"]
+
+# Constants
+_FACE_NODES = numpy.array([[0, 1, 2], [0, 1, 3], [1, 2, 3], [0, 2, 3]], dtype=numpy.intp)
+"""numpy.ndarray: the local vertex indices that make up each of the four faces of a tetrahedron."""
+
+
+def compute_face_ids(tets_t: numpy.ndarray, N_vertices: int, face_ids: numpy.ndarray):
+    """Compute the unique id of each face of each element.
+
+    For every element, gathers the vertex indices of its four faces (see :data:`_FACE_NODES`),
+    sorts each triplet with a three-comparator sorting network, and packs it into a single base
+    ``N_vertices`` integer id. The ids are written into ``face_ids`` in face-major order, i.e., at
+    flat index ``face_index * N_tets + element_index``. When compiled this runs as a single
+    (parallel, when JIT-compiled) pass over the elements, fusing the gather, canonicalization, and
+    packing done by the vectorized fallback in
+    :meth:`edg_acoustics.Mesh.compute_element_connectivity`.
+
+    Args:
+        tets_t (numpy.ndarray): an ``[N_tets, 4]`` array with the vertex indices of each element
+            (the transpose of :attr:`edg_acoustics.Mesh.EToV`).
+        N_vertices (int): see :attr:`edg_acoustics.Mesh.N_vertices`.
+        face_ids (numpy.ndarray): an ``[4 * N_tets]`` int64 array, updated in place.
+    """
+    N_tets = tets_t.shape[0]
+    for tet in prange(N_tets):
+        for face in range(_FACE_NODES.shape[0]):
+            vertex_0 = numpy.int64(tets_t[tet, _FACE_NODES[face, 0]])
+            vertex_1 = numpy.int64(tets_t[tet, _FACE_NODES[face, 1]])
+            vertex_2 = numpy.int64(tets_t[tet, _FACE_NODES[face, 2]])
+            if vertex_0 > vertex_1:
+                vertex_0, vertex_1 = vertex_1, vertex_0
+            if vertex_1 > vertex_2:
+                vertex_1, vertex_2 = vertex_2, vertex_1
+            if vertex_0 > vertex_1:
+                vertex_0, vertex_1 = vertex_1, vertex_0
+            face_ids[face * N_tets + tet] = (
+                vertex_0 * N_vertices + vertex_1
+            ) * N_vertices + vertex_2
+
+
+def match_faces(
+    face_ids: numpy.ndarray,
+    face_vertices_idx: numpy.ndarray,
+    EToE_flat: numpy.ndarray,
+    EToF_flat: numpy.ndarray,
+    N_tets: int,
+):
+    """Match the twin faces of neighboring elements and fill in the element connectivity.
+
+    Given the sorted face ids (identical faces are adjacent) and the original index of each face,
+    performs a single linear scan over the faces and, for each pair of twin faces, writes the
+    neighbor element index and neighbor face index directly into the (flattened) EToE and EToF
+    arrays. The flat index of a face is ``face_index * N_tets + element_index``, i.e., the C-order
+    flat index into the ``[4, N_tets]`` connectivity arrays.
+
+    Args:
+        face_ids (numpy.ndarray): the sorted unique face ids, see
+            :meth:`edg_acoustics.Mesh.compute_element_connectivity`.
+        face_vertices_idx (numpy.ndarray): the original (flat) index of each face, reordered by the
+            sorting of the face ids.
+        EToE_flat (numpy.ndarray): flat view of EToE, see :attr:`edg_acoustics.Mesh.EToE`, updated
+            in place.
+        EToF_flat (numpy.ndarray): flat view of EToF, see :attr:`edg_acoustics.Mesh.EToF`, updated
+            in place.
+        N_tets (int): see :attr:`edg_acoustics.Mesh.N_tets`.
+    """
+    for idx in range(face_ids.shape[0] - 1):
+        if face_ids[idx] == face_ids[idx + 1]:
+            # Faces idx and idx + 1 are the two copies of an interior face, one for the element on
+            # each side (L and R). Associate the element and face indices of each side to the other.
+            L_face_idx = face_vertices_idx[idx]
+            R_face_idx = face_vertices_idx[idx + 1]
+            EToE_flat[L_face_idx] = R_face_idx % N_tets
+            EToE_flat[R_face_idx] = L_face_idx % N_tets
+            EToF_flat[L_face_idx] = R_face_idx // N_tets
+            EToF_flat[R_face_idx] = L_face_idx // N_tets
+
+
+def radix_argsort(keys: numpy.ndarray):
+    """Return the stable permutation that sorts the (non-negative) integer keys.
+
+    Least-significant-digit radix argsort with 8-bit digits: up to eight counting passes over the
+    keys, O(N) in total, versus the O(N log N) comparison sort behind ``numpy.argsort``. Passes in
+    which all keys share the same digit (common for the high bytes of the packed face ids, which
+    are bounded by ``N_vertices**3``) are skipped. Like ``numpy.argsort(kind="stable")``, equal
+    keys keep their original relative order.
+
+    Args:
+        keys (numpy.ndarray): an ``[N]`` int64 array of non-negative keys.
+
+    Returns:
+        perm (numpy.ndarray): an ``[N]`` int64 array with the sorting permutation, i.e.,
+        ``keys[perm]`` is sorted.
+    """
+    n = keys.shape[0]
+    perm = numpy.empty(n, dtype=numpy.int64)
+    for i in range(n):
+        perm[i] = i
+    perm_next = numpy.empty(n, dtype=numpy.int64)
+    counts = numpy.empty(256, dtype=numpy.int64)
+    for shift in range(0, 64, 8):
+        # Count the occurrences of each digit value
+        counts[:] = 0
+        for i in range(n):
+            counts[(keys[i] >> shift) & 0xFF] += 1
+        # If all keys share the same digit this pass would be the identity, skip it
+        skip = False
+        for digit in range(256):
+            if counts[digit] == n:
+                skip = True
+                break
+        if skip:
+            continue
+        # Exclusive prefix sum: counts[digit] becomes the output offset of the first key with
+        # that digit
+        total = 0
+        for digit in range(256):
+            count = counts[digit]
+            counts[digit] = total
+            total += count
+        # Stable scatter of the current permutation by this digit
+        for i in range(n):
+            digit = (keys[perm[i]] >> shift) & 0xFF
+            perm_next[counts[digit]] = perm[i]
+            counts[digit] += 1
+        perm, perm_next = perm_next, perm
+    return perm
+
+
+# The signatures the kernels are ahead-of-time compiled with. tets_t is the transpose of the
+# C-contiguous int32 EToV array, hence the unconstrained 2D int32 layout.
+_AOT_SIGNATURES = {
+    "compute_face_ids": "void(i4[:,:], i8, i8[::1])",
+    "match_faces": "void(i8[::1], i8[::1], i8[::1], i8[::1], i8)",
+    "radix_argsort": "i8[::1](i8[::1])",
+}
+
+# Keep a reference to the plain Python implementations, the names below are rebound to the
+# compiled versions and the ahead-of-time compiler needs the originals.
+_PYTHON_KERNELS = {
+    "compute_face_ids": compute_face_ids,
+    "match_faces": match_faces,
+    "radix_argsort": radix_argsort,
+}
+
+try:
+    # Use the ahead-of-time compiled library if it has been built, see the module docstring.
+    # An AttributeError means the library predates one of the kernels (stale build); fall back to
+    # JIT compilation in that case as well.
+    from edg_acoustics import _mesh_kernels_aot
+
+    compute_face_ids = _mesh_kernels_aot.compute_face_ids
+    match_faces = _mesh_kernels_aot.match_faces
+    radix_argsort = _mesh_kernels_aot.radix_argsort
+    HAVE_COMPILED_KERNELS = True
+except (ImportError, AttributeError):
+    # Compile the original Python implementations: the names above may have been partially
+    # rebound before a stale ahead-of-time library raised.
+    if numba is not None:
+        compute_face_ids = numba.njit(cache=True, nogil=True, parallel=True)(
+            _PYTHON_KERNELS["compute_face_ids"]
+        )
+        match_faces = numba.njit(cache=True, nogil=True)(_PYTHON_KERNELS["match_faces"])
+        radix_argsort = numba.njit(cache=True, nogil=True)(_PYTHON_KERNELS["radix_argsort"])
+        HAVE_COMPILED_KERNELS = True
+    else:
+        HAVE_COMPILED_KERNELS = False
+
+
+_RADIX_ARGSORT_MIN_SIZE = 1 << 20
+"""int: minimum number of keys for which the compiled radix argsort is preferred over
+numpy.argsort; below this the comparison sort is just as fast and avoids the extra passes."""
+
+
+def argsort_face_ids(face_ids: numpy.ndarray):
+    """Return the stable permutation that sorts the face ids.
+
+    Large inputs are sorted with the compiled :func:`radix_argsort` (O(N) counting passes);
+    smaller inputs, or builds without compiled kernels, use ``numpy.argsort(kind="stable")``. Both
+    orderings are stable, so the result is identical either way.
+
+    Args:
+        face_ids (numpy.ndarray): an ``[4 * N_tets]`` int64 array with the packed face ids.
+
+    Returns:
+        perm (numpy.ndarray): the sorting permutation, see :func:`radix_argsort`.
+    """
+    if HAVE_COMPILED_KERNELS and face_ids.shape[0] >= _RADIX_ARGSORT_MIN_SIZE:
+        return radix_argsort(face_ids)
+    return numpy.argsort(face_ids, kind="stable")
+
+
+def _build_aot_compiler():
+    """Creates the numba ahead-of-time compiler with the kernels of this module registered."""
+    from numba.pycc import CC  # local import, only needed when building the library
+
+    cc = CC("_mesh_kernels_aot")
+    for name, signature in _AOT_SIGNATURES.items():
+        cc.export(name, signature)(_PYTHON_KERNELS[name])
+    return cc
+
+
+if __name__ == "__main__":
+    _build_aot_compiler().compile()
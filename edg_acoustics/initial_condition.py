@@ -5,11 +5,54 @@ The current version of edg_acoustics.initial_condition provides monopole source
 
 from __future__ import annotations
 import abc
+import math
 import numpy
 
+try:
+    # numba is an optional dependency, used to speed up the evaluation of the initial condition
+    import numba
+    from numba import prange
+except ImportError:
+    numba = None
+    prange = range
+
 __all__ = ["InitialCondition", "Monopole_IC"]
 
 
+def _gaussian_ic(
+    x: numpy.ndarray,
+    y: numpy.ndarray,
+    z: numpy.ndarray,
+    source_x: float,
+    source_y: float,
+    source_z: float,
+    inv_halfwidth2: float,
+    out: numpy.ndarray,
+):
+    """Evaluate the monopole Gaussian pulse over all nodes in a single fused pass.
+
+    Computes ``out[i] = exp(-inv_halfwidth2 * ||(x, y, z)[i] - source||^2)`` for flat views of the
+    nodal coordinates. When numba is available this is JIT-compiled (parallel, fastmath), so the
+    distance computation and the exponential are fused into one pass over the nodes, and the
+    function can also be called from (and inlined into) other numba-compiled code.
+
+    Args:
+        x, y, z (numpy.ndarray): flat 1D views of the nodal coordinates.
+        source_x, source_y, source_z (float): the physical coordinates of the monopole source.
+        inv_halfwidth2 (float): ``log(2) / halfwidth**2`` of the Gaussian pulse.
+        out (numpy.ndarray): flat 1D view of the pressure field, updated in place.
+    """
+    for i in prange(out.shape[0]):
+        dx = x[i] - source_x
+        dy = y[i] - source_y
+        dz = z[i] - source_z
+        out[i] = math.exp(-inv_halfwidth2 * (dx * dx + dy * dy + dz * dz))
+
+
+if numba is not None:
+    _gaussian_ic = numba.njit(cache=True, nogil=True, parallel=True, fastmath=True)(_gaussian_ic)
+
+
 class InitialCondition(abc.ABC):
     """Setup initial condition of a DG acoustics simulation for a specific scenario.
 
@@ -46,37 +89,126 @@ class Monopole_IC(InitialCondition):
         xyz (numpy.ndarray): see :attr:`edg_acoustics.AcousticsSimulation.xyz`.
         source_xyz (numpy.ndarray): an (3,) array containing the physical coordinates of the monopole source.
         halfwidth (float): half-bandwidth of the initial Gaussian pulse.
+        dtype (numpy.dtype): the floating point type of the initial condition fields.
+            <default>: ``numpy.float64``. Use ``numpy.float32`` to halve the memory traffic of the
+            (memory-bound) pressure evaluation when the simulation state is advanced in single
+            precision.
 
     Attributes:
         source_xyz (numpy.ndarray): an (3,) array containing the physical coordinates of the monopole source.
         halfwidth (float): half-bandwidth of the initial Gaussian pulse.
+        dtype (numpy.dtype): the floating point type of the initial condition fields.
     """
 
-    def __init__(self, source_xyz: numpy.ndarray, halfwidth: float):
-        self.source_xyz = source_xyz
+    def __init__(self, source_xyz: numpy.ndarray, halfwidth: float, dtype=numpy.float64):
+        self.dtype = numpy.dtype(dtype)
+        self.source_xyz = numpy.asarray(source_xyz, dtype=self.dtype)
         self.halfwidth = halfwidth
-
-    def Pinit(self, xyz: numpy.ndarray):
-        """Setup initial condition for pressure."""
-        pressure = numpy.exp(
-            -numpy.log(2)
-            * (
-                (xyz[0] - self.source_xyz[0]) ** 2
-                + (xyz[1] - self.source_xyz[1]) ** 2
-                + (xyz[2] - self.source_xyz[2]) ** 2
+        # Precompute the exponent scale log(2)/halfwidth^2 of the Gaussian pulse once, so that
+        # repeated Pinit evaluations do not redo it per call.
+        self._inv_halfwidth2 = float(numpy.log(2) / halfwidth**2)
+
+    def Pinit(self, xyz: numpy.ndarray, out: numpy.ndarray = None):
+        """Setup initial condition for pressure.
+
+        If ``out`` (an ``[Np, N_tets]`` array of dtype :attr:`dtype`) is given, the pressure field
+        is written into it and no new array is allocated, e.g., when re-initializing repeatedly.
+        """
+        # Computes pressure = exp(-log(2) * ||xyz - source_xyz||^2 / halfwidth^2).
+        if out is None:
+            out = numpy.empty((xyz.shape[1], xyz.shape[2]), dtype=self.dtype)
+
+        if numba is not None and out.flags.c_contiguous:
+            # Evaluate the Gaussian with the compiled fused kernel: one parallel pass over the
+            # nodes with no intermediate allocation. The kernel needs a flat view of the output,
+            # hence the contiguity check; non-contiguous outputs take the ufunc path below.
+            _gaussian_ic(
+                xyz[0].ravel(),
+                xyz[1].ravel(),
+                xyz[2].ravel(),
+                float(self.source_xyz[0]),
+                float(self.source_xyz[1]),
+                float(self.source_xyz[2]),
+                self._inv_halfwidth2,
+                out.ravel(),
             )
-            / self.halfwidth**2
-        )
+            return out
+
+        # NumPy fallback: accumulate the squared distance and the Gaussian into the output so that
+        # only one [Np, N_tets] temporary is allocated, instead of one per intermediate result of
+        # the naive expression. The subtractions fix the computation dtype to self.dtype; the
+        # subsequent in-place operations preserve it.
+        numpy.subtract(xyz[0], self.source_xyz[0], out=out)
+        out *= out
+        tmp = numpy.subtract(xyz[1], self.source_xyz[1], dtype=self.dtype)
+        tmp *= tmp
+        out += tmp
+        numpy.subtract(xyz[2], self.source_xyz[2], out=tmp)
+        tmp *= tmp
+        out += tmp
+        out *= -self._inv_halfwidth2
+        numpy.exp(out, out=out)
+        return out
+
+    @staticmethod
+    def Pinit_batch(xyz: numpy.ndarray, sources_xyz: numpy.ndarray, halfwidths: numpy.ndarray):
+        """Setup the pressure initial condition for a batch of monopole sources.
+
+        Evaluates the Gaussian pulse of :meth:`Pinit` for ``K`` sources on the same nodal
+        coordinates. The squared-distance buffer is reused across the sources, so evaluating all
+        `K` Gaussians costs one output array per source plus two shared work arrays, instead of the
+        full set of temporaries per source.
+
+        Args:
+            xyz (numpy.ndarray): see :attr:`edg_acoustics.AcousticsSimulation.xyz`.
+            sources_xyz (numpy.ndarray): an (K, 3) array containing the physical coordinates of the
+                monopole sources.
+            halfwidths (numpy.ndarray): an (K,) array containing the half-bandwidth of the initial
+                Gaussian pulse of each source.
+
+        Returns:
+            pressure (numpy.ndarray): an (K, Np, N_tets) array with the initial pressure field of
+                each source.
+        """
+        sources_xyz = numpy.asarray(sources_xyz, dtype=numpy.float64)
+        halfwidths = numpy.asarray(halfwidths, dtype=numpy.float64)
+        pressure = numpy.empty((sources_xyz.shape[0], xyz.shape[1], xyz.shape[2]))
+        distance2 = numpy.empty((xyz.shape[1], xyz.shape[2]))
+        tmp = numpy.empty_like(distance2)
+        for k in range(sources_xyz.shape[0]):
+            numpy.subtract(xyz[0], sources_xyz[k, 0], out=distance2)
+            distance2 *= distance2
+            numpy.subtract(xyz[1], sources_xyz[k, 1], out=tmp)
+            tmp *= tmp
+            distance2 += tmp
+            numpy.subtract(xyz[2], sources_xyz[k, 2], out=tmp)
+            tmp *= tmp
+            distance2 += tmp
+            distance2 *= -(numpy.log(2) / halfwidths[k] ** 2)
+            numpy.exp(distance2, out=pressure[k])
         return pressure
 
-    def VXinit(self, xyz: numpy.ndarray):
-        """Setup initial condition for velocity in x-direction."""
-        return numpy.zeros([xyz.shape[1], xyz.shape[2]])
-
-    def VYinit(self, xyz: numpy.ndarray):
-        """Setup initial condition for velocity in y-direction."""
-        return numpy.zeros([xyz.shape[1], xyz.shape[2]])
-
-    def VZinit(self, xyz: numpy.ndarray):
-        """Setup initial condition for velocity in z-direction."""
-        return numpy.zeros([xyz.shape[1], xyz.shape[2]])
+    def _zero_velocity(self, xyz: numpy.ndarray, out: numpy.ndarray = None):
+        """Return a zero velocity field of shape ``[Np, N_tets]`` and dtype :attr:`dtype`.
+
+        If ``out`` is given it is zeroed in place and returned, otherwise a new array is
+        allocated. Note that the three velocity components cannot share a single (or read-only
+        broadcast) zeros array because the time integrator advances them in place, see
+        :meth:`edg_acoustics.TSI_TI.step_dt`.
+        """
+        if out is None:
+            return numpy.zeros([xyz.shape[1], xyz.shape[2]], dtype=self.dtype)
+        out[...] = 0
+        return out
+
+    def VXinit(self, xyz: numpy.ndarray, out: numpy.ndarray = None):
+        """Setup initial condition for velocity in x-direction, optionally into ``out``."""
+        return self._zero_velocity(xyz, out)
+
+    def VYinit(self, xyz: numpy.ndarray, out: numpy.ndarray = None):
+        """Setup initial condition for velocity in y-direction, optionally into ``out``."""
+        return self._zero_velocity(xyz, out)
+
+    def VZinit(self, xyz: numpy.ndarray, out: numpy.ndarray = None):
+        """Setup initial condition for velocity in z-direction, optionally into ``out``."""
+        return self._zero_velocity(xyz, out)
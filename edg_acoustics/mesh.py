@@ -11,6 +11,8 @@ from __future__ import annotations
 import meshio
 import numpy
 import edg_acoustics
+from edg_acoustics import _mesh_kernels
+from edg_acoustics._mesh_kernels import _FACE_NODES
 
 __all__ = ["Mesh"]
 
@@ -52,11 +54,11 @@ class Mesh:
 
         EToE (numpy.ndarray): an ``[4, N_tets]`` array containing the information of which elements are neighbors of
             an element, i.e., EToE[j, i] returns the index of the jth neighbor of element `i`. The definition of `j`-th
-            neighbor follows the mesh generator's convention.
+            neighbor follows the mesh generator's convention. Computed lazily on first access and then cached.
 
         EToF (numpy.ndarray): an ``[4 x N_tets]`` array containing the information of which face is shared between the
             element and its neighbor,  i.e.,  EToF[j, i] returns the face index of the `j`-th neighbor of element `i`.
-            Face indices follow the same convention as neighbor indices.
+            Face indices follow the same convention as neighbor indices. Computed lazily on first access and then cached.
 
         EToV (numpy.ndarray): An ``[4 x self.N_tets]`` array containing the 4 indices of the vertices of the :attr:`N_tets`
             tetrahedra that make up the mesh.
@@ -123,40 +125,84 @@ class Mesh:
         # Extract the relevant data and store it in the object
 
         # Read the number of points and their coordinates
+        # The transposed meshio arrays are stored contiguously and with a fixed dtype (float64
+        # coordinates, int32 vertex indices), so downstream code (in particular the connectivity
+        # computation, the hot path of mesh loading) gets unit-stride typed arrays instead of
+        # strided views with a platform-dependent integer type.
         self.N_vertices = mesh_data.points.shape[0]
-        self.vertices = mesh_data.points.transpose()
+        self.vertices = numpy.ascontiguousarray(mesh_data.points.transpose(), dtype=numpy.float64)
 
         # Check if all labels provided as input exist in the mesh data and vice versa, if not, raise error
-        BC_labels_in_mesh = sorted(
-            numpy.unique(mesh_data.cell_data_dict["gmsh:physical"]["triangle"])
-        )  # get labels in the mesh, sort for faster comparison below
-        BC_labels_in_input = sorted(BC_labels.values())  # get all labels specified in input
-        if not BC_labels_in_input == BC_labels_in_mesh:
+        BC_labels_in_mesh = numpy.unique(
+            mesh_data.cell_data_dict["gmsh:physical"]["triangle"]
+        )  # get labels in the mesh, numpy.unique already returns them sorted
+        BC_labels_in_input = numpy.fromiter(
+            BC_labels.values(), dtype=numpy.int64, count=len(BC_labels)
+        )  # get all labels specified in input
+        BC_labels_in_input.sort()
+        if not numpy.array_equal(BC_labels_in_mesh.astype(numpy.int64), BC_labels_in_input):
             raise ValueError(
                 "[edg_acoustics.Mesh] All BC labels must be present in the mesh and all labels in the mesh must be "
                 "present in BC_labels."
             )
 
         # Read the boundary triangles and their definitions separating them into the different boundary condition labels
+        # Instead of scanning the full physical-tag array once per label (one bool mask per label),
+        # sort the triangles by tag once and then extract each label's triangles as a contiguous
+        # slice located with searchsorted. The stable sort preserves the original triangle order
+        # within each label.
+        triangles_sort_indices = numpy.argsort(
+            mesh_data.cell_data_dict["gmsh:physical"]["triangle"], kind="stable"
+        )
+        sorted_triangle_tags = mesh_data.cell_data_dict["gmsh:physical"]["triangle"][
+            triangles_sort_indices
+        ]
+        sorted_triangles = mesh_data.cells_dict["triangle"][triangles_sort_indices]
         self.N_BC_triangles = {}
         self.BC_triangles = {}
         for BC_label in BC_labels:
-            triangles_have_label = (
-                mesh_data.cell_data_dict["gmsh:physical"]["triangle"] == BC_labels[BC_label]
-            )  # array with bools specifying if triangle has BC_label or not
-            self.N_BC_triangles[BC_label] = (
-                triangles_have_label.sum()
+            label_start, label_end = numpy.searchsorted(
+                sorted_triangle_tags, [BC_labels[BC_label], BC_labels[BC_label] + 1]
+            )  # the triangles with this label form the slice [label_start, label_end) after sorting
+            self.N_BC_triangles[BC_label] = int(
+                label_end - label_start
             )  # number of triangles with label BC_label
-            self.BC_triangles[BC_label] = mesh_data.cells_dict["triangle"][
-                triangles_have_label
+            self.BC_triangles[BC_label] = sorted_triangles[
+                label_start:label_end
             ]  # get the triangles with BC_label
 
         # Read the number of tetrahedra (computational elements) and their definitions
         self.N_tets = mesh_data.cells_dict["tetra"].shape[0]
-        self.EToV = mesh_data.cells_dict["tetra"].transpose()
+        self.EToV = numpy.ascontiguousarray(
+            mesh_data.cells_dict["tetra"].transpose(), dtype=numpy.int32
+        )
 
-        # Compute the mesh connectivity
-        self.EToE, self.EToF = self.compute_element_connectivity(self.EToV)
+        # The mesh connectivity (EToE, EToF) is not computed here but lazily, on first access of
+        # either property, since not all use cases of a Mesh (e.g., boundary condition lookup,
+        # plotting) need it.
+        self._EToE = None
+        self._EToF = None
+
+    # Properties -------------------------------------------------------------------------------------------------------
+    @property
+    def EToE(self):
+        """numpy.ndarray: see :attr:`EToE`. Computed on first access and then cached."""
+        if self._EToE is None:
+            self._compute_connectivity()
+        return self._EToE
+
+    @property
+    def EToF(self):
+        """numpy.ndarray: see :attr:`EToF`. Computed on first access and then cached."""
+        if self._EToF is None:
+            self._compute_connectivity()
+        return self._EToF
+
+    def _compute_connectivity(self):
+        """Computes and caches the element connectivity, see :meth:`compute_element_connectivity`."""
+        self._EToE, self._EToF = self.compute_element_connectivity(self.EToV)
+
+    # ------------------------------------------------------------------------------------------------------------------
 
     # Operators --------------------------------------------------------------------------------------------------------
     def __eq__(self, other: edg_acoustics.Mesh):
@@ -213,73 +259,113 @@ class Mesh:
         # Get information on the number of faces, EToV, and vertices
         N_faces_per_tet = 4  # number of faces per element
         N_tets = EToV.shape[1]  # number of elements in the mesh
-        # N_vertices = EToV.max() + 1  # number of vertices in the mesh, +1 because indexing starts at 0
 
         # Create a unique identifier for each face based on the vertices that make up the face
         # the order of the vertices does not matter.
+        # Since the vertex indices of each face are sorted before the id is built, packing them
+        # into a single integer (base N_vertices) gives a unique number per face, with identical
+        # faces getting identical ids. This follows the old algorithm (here in Matlab form)
+        #   id = fnodes(:,1)*Nnodes*Nnodes + fnodes(:,2)*Nnodes+fnodes(:,3)+1;
+        # The ids are stored in face-major order (all faces 0 first, then all faces 1, ...), which
+        # the flat face indices used below rely on. We use int64 to avoid overflow for large
+        # meshes.
+        N_vertices = int(EToV.max()) + 1  # number of vertices in the mesh, +1 because indexing starts at 0
+
+        if _mesh_kernels.HAVE_COMPILED_KERNELS:
+            # Compute all face ids in a single compiled pass over the elements, fusing the
+            # face gather, the vertex canonicalization, and the id packing of the fallback below.
+            # The kernel is compiled for int32 vertex indices (the dtype :attr:`EToV` is stored
+            # with); the astype is a no-copy pass-through in that case and a safety conversion for
+            # other integer inputs.
+            face_ids = numpy.empty(N_tets * N_faces_per_tet, dtype=numpy.int64)
+            _mesh_kernels.compute_face_ids(
+                tets_t.astype(numpy.int32, copy=False), N_vertices, face_ids
+            )
+        else:
+            # This is achieved by first constructing a list with all indices of the vertices of the
+            # faces of the elements. This is done face by face (see _FACE_NODES):
+            #    Face 0: made up of vertices [0, 1, 2]
+            #    Face 1: made up of vertices [0, 1, 3]
+            #    Face 2: made up of vertices [1, 2, 3]
+            #    Face 3: made up of vertices [0, 2, 3]
+            # A single gather with the _FACE_NODES index table builds the [4 * N_tets, 3] array in
+            # one allocation.
+            face_vertices = tets_t[:, _FACE_NODES].transpose(1, 0, 2).reshape(-1, 3)
+
+            # Extract the three vertex indices of each face as separate contiguous 1D arrays
+            # (structure-of-arrays layout). The sorting and face id construction below then operate
+            # on unit-stride columns instead of strided rows of the 2D table, which is not needed
+            # after this point.
+            face_vertices_0 = face_vertices[:, 0].astype(numpy.int64)
+            face_vertices_1 = face_vertices[:, 1].astype(numpy.int64)
+            face_vertices_2 = face_vertices[:, 2].astype(numpy.int64)
+
+            # Then we sort the indices in each face, so that we can easily identify if two faces
+            # are the same by the ordered sequence of nodes. A generic sort on rows of length 3 is
+            # dominated by per-row dispatch overhead, so we use a three-comparator sorting network
+            # instead: three pairs of vectorized minimum/maximum passes over the columns.
+            face_vertices_0, face_vertices_1 = (
+                numpy.minimum(face_vertices_0, face_vertices_1),
+                numpy.maximum(face_vertices_0, face_vertices_1),
+            )
+            face_vertices_1, face_vertices_2 = (
+                numpy.minimum(face_vertices_1, face_vertices_2),
+                numpy.maximum(face_vertices_1, face_vertices_2),
+            )
+            face_vertices_0, face_vertices_1 = (
+                numpy.minimum(face_vertices_0, face_vertices_1),
+                numpy.maximum(face_vertices_0, face_vertices_1),
+            )
 
-        # This is achieved by first constructing a list with all indices of the vertices of the faces of the elements.
-        # This is done face by face:
-        #    Face 0: made up of vertices [0, 1, 2]
-        #    Face 1: made up of vertices [0, 1, 3]
-        #    Face 2: made up of vertices [1, 2, 3]
-        #    Face 3: made up of vertices [0, 2, 3]
-        face_vertices = numpy.vstack(
-            [
-                tets_t[:, [0, 1, 2]],
-                tets_t[:, [0, 1, 3]],
-                tets_t[:, [1, 2, 3]],
-                tets_t[:, [0, 2, 3]],
-            ]
-        )
-
-        # Then we sort the indices in each face, so that we can easily identify if two faces are the same by the ordered
-        # sequence of nodes
-        face_vertices.sort(axis=-1)
-
-        # Construct and array with the index of each face in face_vertices
-        face_vertices_idx = numpy.arange(0, N_tets * N_faces_per_tet)
+            face_ids = (
+                face_vertices_0 * N_vertices + face_vertices_1
+            ) * N_vertices + face_vertices_2
 
         # EToE must be initialized with (the element index of the element)
         # EToE = [[ 0  1  2 ... (N_tets - 1)]
         #         [ 0  1  2 ... (N_tests - 1)]
         #         [ 0  1  2 ... (N_tests - 1)]
         #         [ 0  1  2 ... (N_tests - 1)]]
-        EToE = numpy.arange(0, N_tets).reshape([1, -1]).repeat(repeats=N_faces_per_tet, axis=0)
+        # The row pattern is written by broadcast assignment into a preallocated array, avoiding the
+        # intermediate arrays of reshape + repeat. The dtype is fixed to int64 so that it does not
+        # depend on the platform default (and matches what the compiled matching loop expects).
+        EToE = numpy.empty((N_faces_per_tet, N_tets), dtype=numpy.int64)
+        EToE[:] = numpy.arange(N_tets)
 
         # EToF must be initialized with (the face index)
         # EToF = [[  0  0  0  ... 0]       |
         #         [  1  1  1  ... 1]       |> has N_tets columns
         #         [  2  2  2  ... 2]       |
         #         [  3  3  3  ... 3]]      |
-        EToF = numpy.arange(0, 4).repeat(repeats=N_tets, axis=0).reshape([-1, N_tets])
-
-        # We now need to uniquely number each set of three faces by their node numbers
-        # We could use the old algorithm (here in Matlab form)
-        #   id = fnodes(:,1)*Nnodes*Nnodes + fnodes(:,2)*Nnodes+fnodes(:,3)+1;
-        # Or we can explicitly use a hash (which is essentially what the old code does). A hash just transforms the
-        # three indices that defines all faces into a unique number. Note that we apply the hash to each row
-        # (hence the 1).
-        face_ids = numpy.apply_along_axis(lambda x: hash(tuple(x)), 1, face_vertices)
+        EToF = numpy.empty((N_faces_per_tet, N_tets), dtype=numpy.int64)
+        EToF[:] = numpy.arange(N_faces_per_tet)[:, None]
 
         # We now sort the face_ids so that we have the identical faces next to each other
-        face_ids_sort_indices = numpy.argsort(face_ids)  # get the ordering that sorts the face_ids
+        face_ids_sort_indices = _mesh_kernels.argsort_face_ids(
+            face_ids
+        )  # get the (stable) ordering that sorts the face_ids
         face_ids = face_ids[face_ids_sort_indices]  # sort the face ids
-        face_vertices = face_vertices[
-            face_ids_sort_indices, :
-        ]  # reorder the faces so that their corresponding face_ids are sorted
-        face_vertices_idx = face_vertices_idx[
-            face_ids_sort_indices
-        ]  # reorder the face indices so that their corresponding face_ids are sorted
+        # Note that face_ids_sort_indices doubles as the original (flat) index of each sorted face:
+        # before sorting, the index of face i in face_ids is simply i, so gathering an arange with
+        # face_ids_sort_indices would reproduce face_ids_sort_indices itself.
+
+        if _mesh_kernels.HAVE_COMPILED_KERNELS:
+            # Match the twin faces with a single compiled linear scan over the sorted face ids,
+            # writing the neighbor information directly into (flat views of) EToE and EToF. This
+            # avoids the temporary index arrays and the multiple gather/scatter passes of the
+            # NumPy fallback below.
+            _mesh_kernels.match_faces(
+                face_ids, face_ids_sort_indices, EToE.ravel(), EToF.ravel(), N_tets
+            )
+            return EToE, EToF
 
         # Find the indices of face_ids of all interior faces, i.e., that are shared by two elements
         # i.e., faces that appear twice (one time for each element)
         # Note that these faces appear in pairs (one for each element that shares the face), this index, points to the
-        # first face.
-        # We wrap numpy.where with numpy.array to get and numpy.array instead of a tuple, we do this because later we
-        # need to use these indices and these indices +1, with tuple is not possible. The flatten in the end is to avoid
-        # having [[]], which means an extra (unused) dimension in the array.
-        interior_face_id_idx = numpy.array(numpy.where(face_ids[0:-1] == face_ids[1:])).flatten()
+        # first face. Since the face_ids are sorted, twin faces are exactly the places where the
+        # difference between consecutive face_ids is zero; numpy.flatnonzero returns their indices
+        # directly as a flat numpy.ndarray, so these indices and these indices +1 can be used below.
+        interior_face_id_idx = numpy.flatnonzero(numpy.diff(face_ids) == 0)
 
         # With the indices of face_ids we can compute the indices of the faces associated to the face definition on an
         # element (L) and the neighboring element (R). The interior_faces_face_id_idx corresponds to the indices on the
@@ -294,40 +380,33 @@ class Mesh:
         # for the Right element. We need to associate the element numbers to each other (EToE) and we need to
         # associate the element number of the element on the left to the face number of the element on the right, and
         # vice versa.
-        interior_L_face_vertices_idx = face_vertices_idx[interior_face_id_idx]
-        interior_R_face_vertices_idx = face_vertices_idx[interior_face_id_idx + 1]
+        interior_L_face_vertices_idx = face_ids_sort_indices[interior_face_id_idx]
+        interior_R_face_vertices_idx = face_ids_sort_indices[interior_face_id_idx + 1]
 
         # Construct EToE
         # Here we simply associate the R element index to the L element, and then associate the L element index to the
         # R element. Note that here the initialization of EToE plays an important role. We initialized EToE to have
         # the value of the current element for all faces of the element. In this way we can use it on the right-hand
         # side.
-        EToE[
-            numpy.unravel_index(
-                numpy.hstack([interior_L_face_vertices_idx, interior_R_face_vertices_idx]),
-                EToE.shape,
-            )
-        ] = EToE[
-            numpy.unravel_index(
-                numpy.hstack([interior_R_face_vertices_idx, interior_L_face_vertices_idx]),
-                EToE.shape,
-            )
-        ]
+        # The flat index of a face (face_index * N_tets + element_index) is exactly its C-order flat
+        # index into the [4, N_tets] connectivity arrays, so the neighbor information is swapped
+        # between the twin faces with plain 1D assignments on flat views: no unravel_index and no
+        # stacked index temporaries. The right-hand side gathers are evaluated before the scatters,
+        # so the swap semantics are preserved.
+        EToE_flat = EToE.ravel()
+        EToE_flat[interior_L_face_vertices_idx], EToE_flat[interior_R_face_vertices_idx] = (
+            EToE_flat[interior_R_face_vertices_idx],
+            EToE_flat[interior_L_face_vertices_idx],
+        )
 
         # Construct EToF
         # The logic is the same as for EToE, the difference is that we now use the initialized EToF on the right-hand
         # side.
-        EToF[
-            numpy.unravel_index(
-                numpy.vstack([interior_L_face_vertices_idx, interior_R_face_vertices_idx]),
-                EToF.shape,
-            )
-        ] = EToF[
-            numpy.unravel_index(
-                numpy.vstack([interior_R_face_vertices_idx, interior_L_face_vertices_idx]),
-                EToF.shape,
-            )
-        ]
+        EToF_flat = EToF.ravel()
+        EToF_flat[interior_L_face_vertices_idx], EToF_flat[interior_R_face_vertices_idx] = (
+            EToF_flat[interior_R_face_vertices_idx],
+            EToF_flat[interior_L_face_vertices_idx],
+        )
 
         return EToE, EToF
 